@@ -31,7 +31,7 @@ import pandas as pd
 import streamlit as st
 
 from utils.reports_utils import create_gap_report
-from utils.snowflake_utils import fetch_distinct_values
+from utils.snowflake_utils import fetch_distinct_values_many
 from utils.gap_history_helpers import normalize_upc
 
 
@@ -135,9 +135,18 @@ def render():
     # Filter options
     # ------------------------------------------------------------------
     try:
-        salesperson_options = fetch_distinct_values(conn, "CUSTOMERS", "SALESPERSON")
-        store_options = fetch_distinct_values(conn, "CUSTOMERS", "CHAIN_NAME")
-        supplier_options = fetch_distinct_values(conn, "SUPPLIER_COUNTY", "SUPPLIER")
+        # One concurrent batch instead of three sequential round-trips
+        filter_values = fetch_distinct_values_many(
+            conn,
+            [
+                ("CUSTOMERS", "SALESPERSON"),
+                ("CUSTOMERS", "CHAIN_NAME"),
+                ("SUPPLIER_COUNTY", "SUPPLIER"),
+            ],
+        )
+        salesperson_options = filter_values[("CUSTOMERS", "SALESPERSON")]
+        store_options = filter_values[("CUSTOMERS", "CHAIN_NAME")]
+        supplier_options = filter_values[("SUPPLIER_COUNTY", "SUPPLIER")]
     except Exception as e:
         st.error(f"❌ Failed to fetch filter values: {e}")
         return
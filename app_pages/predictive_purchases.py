@@ -1,7 +1,7 @@
 # ------------------------------------------- predictive_purchases.py ------------------------------------------------------
 """
 Predictive Purchases Page
-- Admin uploads sales file → loads RAW → aggregates WEEKLY → runs forecasts.
+- Admin uploads sales file → loads RAW → aggregates WEEKLY (async MERGE, polled) → runs forecasts.
 - Accepts UPC (+ optional PRODUCT_ID) list; forecasts tenant-wide totals.
 - Generates a branded PDF report.
 
@@ -12,13 +12,17 @@ Dev notes:
 """
 
 import re
+import time
 import pandas as pd
 import streamlit as st
 import altair as alt
-from utils.sales_ingest import load_sales_file
+from utils.sales_ingest import load_sales_file, get_weekly_merge_status
 from utils.forecasting import fetch_weekly_upc_rollup, forecast_units, infer_revenue
 from utils.pdf_reports import build_predictive_purchases_pdf
 
+# Longest we block the page polling the weekly MERGE before handing back control
+MERGE_POLL_MAX_WAIT_S = 120
+
 
 # ---------------- Helper ----------------
 def _parse_entries(text: str):
@@ -51,12 +55,39 @@ def render():
 
     if uploaded and st.button("Load & Aggregate", type="primary"):
         try:
-            import_id = load_sales_file(uploaded, source="CSV")
-            st.success(f"Loaded & aggregated. Import ID: {import_id}")
-            st.rerun()
+            st.session_state["sales_import_id"] = load_sales_file(uploaded, source="CSV")
         except Exception as e:
             st.error(f"Load failed: {e}")
 
+    # ---------- Weekly aggregation status (async MERGE) ----------
+    import_id = st.session_state.get("sales_import_id")
+    if import_id:
+        status_box = st.empty()
+        deadline = time.monotonic() + MERGE_POLL_MAX_WAIT_S
+        try:
+            status = get_weekly_merge_status(import_id)
+            while status == "AGGREGATING" and time.monotonic() < deadline:
+                status_box.info(f"⏳ Loaded. Aggregating weekly sales... Import ID: {import_id}")
+                time.sleep(2)
+                status = get_weekly_merge_status(import_id)
+        except Exception as e:
+            status_box.error(f"Could not check aggregation status: {e}")
+        else:
+            if status == "AGGREGATED":
+                status_box.success(f"Loaded & aggregated. Import ID: {import_id}")
+            elif status == "AGGREGATING":
+                status_box.info(
+                    "Weekly aggregation is still running; check back shortly "
+                    f"(SALES_UPLOAD_LOGS). Import ID: {import_id}"
+                )
+            else:
+                status_box.error(
+                    f"Weekly aggregation {str(status or 'unknown').lower()}. Import ID: {import_id}"
+                )
+        finally:
+            # Report once per upload; later reruns must not re-poll or repeat errors
+            st.session_state.pop("sales_import_id", None)
+
     # ---------- Forecast Form ----------
     st.subheader("Forecast")
     with st.form("forecast_form", clear_on_submit=False):
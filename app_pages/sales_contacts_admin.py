@@ -625,6 +625,7 @@ def _render_reassignment(conn, tenant_id: int, contacts_df: pd.DataFrame):
                 old_salesperson=preview_old,
                 new_salesperson=preview_new,
                 update_sales_contacts=False,  # ✅ CRITICAL
+                manage_transaction=False,  # BEGIN/COMMIT owned by this page
             )
 
             deactivate_contact_by_name(conn, tenant_id=tenant_id, salesperson_name=preview_old)
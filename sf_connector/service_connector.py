@@ -1,5 +1,6 @@
 ﻿import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="pandas.io.sql")
+from functools import lru_cache
 import streamlit as st
 import snowflake.connector as snowflake_connector
 from packaging import version  # ✅ to handle version parsing
@@ -15,6 +16,19 @@ def load_private_key(pem_input):
         password=None
     )
 
+# ============================ Helper: PEM -> PKCS#8 DER (cached) ============================
+
+@lru_cache(maxsize=8)
+def pem_to_pkcs8_der(pem_bytes: bytes) -> bytes:
+    # RSA key parsing/validation is the expensive part of connecting; the same
+    # service-account / tenant PEM is reused for every connection, so convert
+    # it once per process. Single parse path for both connectors.
+    return load_private_key(pem_bytes).private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+
 # ============================ Helper: Build connection args ============================
 
 def build_connection_args(base_args: dict):
@@ -32,13 +46,8 @@ def build_connection_args(base_args: dict):
 def get_service_account_connection():
     try:
         secrets = st.secrets["snowflake_connect"]
-        private_key_obj = load_private_key(secrets["sf_private_key"])
-
-        private_key = private_key_obj.private_bytes(
-            encoding=serialization.Encoding.DER,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
+        pem = secrets["sf_private_key"]
+        private_key = pem_to_pkcs8_der(pem.encode() if isinstance(pem, str) else bytes(pem))
 
         base_args = dict(
             user=secrets["sf_user"],
@@ -59,13 +68,8 @@ def get_service_account_connection():
 # ============================ Tenant Connector ============================
 
 def connect_to_tenant_snowflake(tenant_config):
-    private_key_obj = load_private_key(tenant_config["private_key"])
-
-    private_key = private_key_obj.private_bytes(
-        encoding=serialization.Encoding.DER,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption()
-    )
+    pem = tenant_config["private_key"]
+    private_key = pem_to_pkcs8_der(pem.encode() if isinstance(pem, str) else bytes(pem))
 
     base_args = dict(
         user=tenant_config["snowflake_user"],
@@ -77,12 +81,6 @@ def connect_to_tenant_snowflake(tenant_config):
         role=tenant_config["role"]
     )
 
-    conn = snowflake_connector.connect(**build_connection_args(base_args))
-
-    # Optional context verification
-    cursor = conn.cursor()
-    cursor.execute("SELECT CURRENT_ROLE(), CURRENT_USER(), CURRENT_DATABASE(), CURRENT_SCHEMA()")
-    # st.write("🔍 Snowflake Context:", cursor.fetchone())
-    cursor.close()
-
-    return conn
+    # The key-pair auth handshake in connect() already proves the key and
+    # context are valid; no separate verification query is needed.
+    return snowflake_connector.connect(**build_connection_args(base_args))
@@ -1,26 +1,18 @@
 ﻿# ----------- tenants/tenant_manager.py ------------------------
 from __future__ import annotations
 
-import binascii
 import base64
 import hashlib
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 import streamlit as st
 from cryptography.fernet import Fernet
-from sf_connector.service_connector import get_service_account_connection
+from sf_connector.service_connector import get_service_account_connection, pem_to_pkcs8_der
 
 
 # ---------- small helpers ----------
 
-def _is_hex(s: str) -> bool:
-    """True if s looks like hex and has even length."""
-    if not isinstance(s, str):
-        return False
-    s = s.strip()
-    return len(s) % 2 == 0 and all(c in "0123456789abcdefABCDEF" for c in s)
-
-
 def _sha8(b: bytes) -> str:
     """Non-sensitive 8-char sha256 fingerprint."""
     try:
@@ -43,6 +35,12 @@ def _require_fernet_key() -> str:
     return fkey
 
 
+@lru_cache(maxsize=8)
+def _get_fernet(fkey: str) -> Fernet:
+    """Fernet instance per key, built once per process (key decode + HMAC/AES setup)."""
+    return Fernet(fkey.encode("utf-8"))
+
+
 def _decrypt_tenant_key_from_db(raw_value: Any) -> str:
     """
     Accepts PRIVATE_KEY_ENCRYPTED from DB:
@@ -61,10 +59,18 @@ def _decrypt_tenant_key_from_db(raw_value: Any) -> str:
         raise RuntimeError("SERVICE_KEYS.PRIVATE_KEY_ENCRYPTED is empty")
 
     fkey = _require_fernet_key()
-    fernet = Fernet(fkey.encode("utf-8"))
+    fernet = _get_fernet(fkey)
 
-    # Convert to bytes for decrypt: hex → bytes; else encode
-    cipher_bytes = binascii.unhexlify(raw_str) if _is_hex(raw_str) else raw_str.encode("utf-8")
+    # Convert to bytes for decrypt: hex → bytes; else encode.
+    # bytes.fromhex validates and decodes in one C pass (and skips embedded
+    # whitespace/newlines); a raw 'gAAAA...' token fails fast on the first
+    # non-hex character.
+    try:
+        cipher_bytes = bytes.fromhex(raw_str)
+        is_hex = True
+    except ValueError:
+        cipher_bytes = raw_str.encode("utf-8")
+        is_hex = False
 
     try:
         pem = fernet.decrypt(cipher_bytes).decode("utf-8")
@@ -74,11 +80,15 @@ def _decrypt_tenant_key_from_db(raw_value: Any) -> str:
         raise RuntimeError(
             f"Failed to decrypt tenant private key "
             f"(fernet_sha8={_sha8(fkey.encode())}, "
-            f"blob_prefix={ct_prefix!r}, is_hex={_is_hex(raw_str)})"
+            f"blob_prefix={ct_prefix!r}, is_hex={is_hex})"
         ) from e
 
-    if not pem.startswith("-----BEGIN "):
-        raise RuntimeError("Decryption succeeded but result does not look like a PEM key")
+    # Let the key parser decide; it accepts every PEM flavour Snowflake does and
+    # its cached result is reused when the tenant connection is opened.
+    try:
+        pem_to_pkcs8_der(pem.encode("utf-8"))
+    except Exception as e:
+        raise RuntimeError("Decryption succeeded but result is not a valid PEM private key") from e
 
     return pem
 
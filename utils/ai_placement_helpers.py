@@ -340,9 +340,29 @@ def fetch_distinct_values(conn, table, column, filters=None):
 
     Returns:
         List of distinct non-null values sorted ascending.
+
+    Cached for 5 minutes per tenant (Streamlit reruns on every widget change);
+    uploads that change the source tables call clear_distinct_values_cache().
+    Errors are raised to the caller and not cached.
     """
+    return _fetch_distinct_values_cached(
+        conn, st.session_state.get("tenant_id"), table, column, filters
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_distinct_values_cached(_conn, tenant_id, table, column, filters=None):
+    """Cached body of fetch_distinct_values(); tenant_id keeps tenants apart."""
+    conn = _conn
     query = f"SELECT DISTINCT {column} FROM {table}"
     if filters:
         query += f" WHERE {filters}"
     query += f" ORDER BY {column}"
-    return pd.read_sql(query, conn)[column].dropna().tolist()
\ No newline at end of file
+    with conn.cursor() as cur:
+        cur.execute(query)
+        return [row[0] for row in cur.fetchall() if row[0] is not None]
+
+
+def clear_distinct_values_cache() -> None:
+    """Drop cached dropdown values (after CUSTOMERS / Distro Grid uploads)."""
+    _fetch_distinct_values_cached.clear()
\ No newline at end of file
@@ -97,16 +97,18 @@ def log_ownership_changes(
             (TENANT_ID, CHAIN_NAME, STORE_NUMBER, OLD_SALESPERSON, NEW_SALESPERSON, UPLOAD_BATCH_ID)
         VALUES (%s, %s, %s, %s, %s, %s)
     """
+    cols = ["CHAIN_NAME", "STORE_NUMBER", "OLD_SALESPERSON", "NEW_SALESPERSON"]
     records = [
         (
             str(tenant_id),
-            str(row["CHAIN_NAME"]),
-            int(row["STORE_NUMBER"]),
-            str(row["OLD_SALESPERSON"]),
-            str(row["NEW_SALESPERSON"]),
+            str(chain_name),
+            int(store_number),
+            str(old_salesperson),
+            str(new_salesperson),
             batch_id,
         )
-        for _, row in changes_df.iterrows()
+        for chain_name, store_number, old_salesperson, new_salesperson
+        in changes_df[cols].itertuples(index=False, name=None)
     ]
 
     with con.cursor() as cur:
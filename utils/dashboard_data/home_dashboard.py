@@ -1,7 +1,7 @@
 # utils/dashboard_data/home_dashboard.py
 import pandas as pd
 import streamlit as st
-from typing import List
+from typing import List, Optional
 
 
 def _q(*parts: str) -> str:
@@ -65,7 +65,11 @@ def fetch_chain_schematic_data(_conn, tenant_config: dict) -> pd.DataFrame:
         ORDER BY "Purchased_Percentage" DESC
     """
     try:
-        df = pd.read_sql(query, _conn)
+        with _conn.cursor() as cur:
+            cur.execute(query)
+            df = cur.fetch_pandas_all()
+        if df.empty:
+            return df
         df["Purchased_Percentage"] = pd.to_numeric(df["Purchased_Percentage"], errors="coerce")
         return df
     except Exception as e:
@@ -181,11 +185,43 @@ def fetch_distinct_values(conn, table_name: str, column_name: str) -> List:
         return [f"Error: {e}"]
 
 
-def fetch_supplier_names(conn) -> List[str]:
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_supplier_names_cached(
+    _conn, tenant_id: str, search: str = "", limit: Optional[int] = None
+) -> List[str]:
+    """Cached body of fetch_supplier_names(); raises on error so failures aren't cached."""
+    query = "SELECT DISTINCT SUPPLIER FROM SUPPLIER_COUNTY WHERE SUPPLIER IS NOT NULL"
+    params = []
+    if search:
+        query += " AND SUPPLIER ILIKE %s"
+        params.append(f"%{search}%")
+    query += " ORDER BY SUPPLIER"
+    if limit:
+        query += " LIMIT %s"
+        params.append(int(limit))
+    with _conn.cursor() as cur:
+        cur.execute(query, params or None)
+        return [row[0] for row in cur.fetchall()]
+
+
+def fetch_supplier_names(
+    conn, tenant_id: str, search: str = "", limit: Optional[int] = None
+) -> List[str]:
+    """
+    Distinct supplier names for dropdowns. Cached per tenant for 5 minutes.
+
+    search: optional case-insensitive substring filter (ILIKE).
+    limit:  optional cap on rows returned, to bound widget payloads.
+    """
+    if not conn:
+        return []
     try:
-        query = "SELECT DISTINCT SUPPLIER FROM SUPPLIER_COUNTY ORDER BY SUPPLIER"
-        df = pd.read_sql(query, conn)
-        return df["SUPPLIER"].dropna().tolist()
+        return _fetch_supplier_names_cached(conn, tenant_id, search, limit)
     except Exception as e:
         st.error(f"Failed to fetch supplier names: {e}")
         return []
+
+
+def clear_supplier_names_cache() -> None:
+    """Drop cached supplier names (after SUPPLIER_COUNTY uploads)."""
+    _fetch_supplier_names_cached.clear()
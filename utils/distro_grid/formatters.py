@@ -252,12 +252,15 @@ def format_uploaded_grid(
     # UI wins: inject CHAIN_NAME from controls
     df["CHAIN_NAME"] = chain_name.strip().upper()
 
-    # Preserve UPC leading zeros Excel strips (VARCHAR(20) column)
+    # Preserve UPC leading zeros Excel strips (VARCHAR(20) column).
+    # Vectorized: numeric UPCs -> int -> zero-padded string; blanks/"0" keep str(x).
     if "UPC" in df.columns:
-        df["UPC"] = df["UPC"].apply(
-            lambda x: str(int(float(x))).zfill(11)
-            if pd.notna(x) and str(x).strip() not in ("", "0")
-            else str(x)
+        upc_str = df["UPC"].astype(str)
+        upc_num = pd.to_numeric(df["UPC"], errors="coerce")
+        pad_mask = upc_num.notna() & ~upc_str.str.strip().isin(["", "0"])
+        df["UPC"] = upc_str.mask(
+            pad_mask,
+            upc_num[pad_mask].astype("int64").astype(str).str.zfill(11),
         )
 
     # Ensure all required upload columns exist
@@ -23,14 +23,17 @@ Notes:
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
 import socket
 
 import pandas as pd
 import streamlit as st
 import openpyxl
 from openpyxl.utils.dataframe import dataframe_to_rows
+from snowflake.connector.pandas_tools import write_pandas
 
 from utils.distro_grid.schema import infer_season_label
+from utils.snowflake_utils import clear_dropdown_caches
 from sf_connector.service_connector import connect_to_tenant_snowflake
 
 
@@ -38,14 +41,20 @@ from sf_connector.service_connector import connect_to_tenant_snowflake
 # IP helper
 # ====================================================================================================================
 
+@lru_cache(maxsize=1)
 def get_local_ip() -> str | None:
     """
     Return the local IP address for logging purposes.
 
-    Falls back to None and logs to stdout on failure; does not raise.
+    Discovers the outbound interface address with a UDP connect (kernel route
+    lookup only — no DNS, no packet sent) and is cached per process. Falls
+    back to None and logs to stdout on failure; does not raise.
     """
     try:
-        return socket.gethostbyname(socket.gethostname())
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.1)
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
     except Exception as e:
         print(f"Error getting IP: {e}")
         return None
@@ -287,15 +296,22 @@ def insert_log_entry(
         success:       True/False flag.
         ip_address:    IP address from session (or 'unknown').
         user_agent:    Optional extra context (e.g., chain name or browser UA).
+
+    The INSERT is submitted with execute_async and never awaited — logging is
+    a side effect and should not add a round-trip to the upload's critical
+    path. A failed log insert is not surfaced.
+
+    Runs on the shared session connection (st.session_state["conn"]) instead
+    of opening a new one per log row; the connection is NOT closed here.
     """
     toml_info = st.session_state.get("toml_info")
-    if not toml_info:
+    conn = st.session_state.get("conn")
+    if not toml_info or not conn:
         # Don't blow up the app over logging
-        print("insert_log_entry: toml_info missing; skipping log insert.")
+        print("insert_log_entry: toml_info or conn missing; skipping log insert.")
         return
 
     try:
-        conn = connect_to_tenant_snowflake(toml_info)
         cursor = conn.cursor()
 
         # Build structured context as JSON — stores fields that don't have
@@ -311,7 +327,7 @@ def insert_log_entry(
         level = "INFO" if success else "ERROR"
         tenant_id = toml_info.get("tenant_id", "unknown")
 
-        cursor.execute(
+        cursor.execute_async(
             """
             INSERT INTO LOG (EVENT_TS, LEVEL, TENANT_ID, MESSAGE, CONTEXT)
             SELECT CURRENT_TIMESTAMP(), %s, %s, %s, PARSE_JSON(%s)
@@ -327,7 +343,6 @@ def insert_log_entry(
 
 
         cursor.close()
-        conn.close()
     except Exception as e:
         print(f"Error occurred while inserting log entry: {str(e)}")
 
@@ -352,10 +367,12 @@ def call_procedure_update_DG(selected_chain: str | None = None):
     - Passes chain directly as a parameter — no session variable needed.
     - Call with selected_chain=None from a Snowflake worksheet or admin tool
       to run a full refresh across all chains.
+    - Uses the shared session connection (st.session_state["conn"]); does
+      NOT close it.
     """
     try:
         toml_info = st.session_state["toml_info"]
-        conn = connect_to_tenant_snowflake(toml_info)
+        conn = st.session_state["conn"]
         cur = conn.cursor()
 
         db = toml_info["database"]
@@ -374,7 +391,6 @@ def call_procedure_update_DG(selected_chain: str | None = None):
             st.warning("⚠️ UPDATE_DISTRO_GRID completed but returned no result.")
 
         cur.close()
-        conn.close()
 
     except Exception as e:
         st.error(f"❌ Procedure call failed: {e}")
@@ -409,6 +425,14 @@ def load_data_into_distro_grid(conn, df, selected_chain, season: str):
     If any step fails the entire transaction is rolled back and the error
     is surfaced to the user — leaving DISTRO_GRID untouched.
 
+    Load strategy:
+    - New rows are bulk-loaded with write_pandas (Parquet PUT + COPY INTO)
+      into a session temp table DISTRO_GRID_UPLOAD *before* the transaction
+      opens — write_pandas creates a temp stage, and DDL would implicitly
+      commit an open transaction.
+    - Inside the transaction, DISTRO_GRID is refilled server-side with
+      INSERT ... SELECT from the temp table (no per-row client traffic).
+
     Archive strategy (v1.2.0):
     - DISTRO_GRID_ARCHIVE_FULL: receives everything from DISTRO_GRID for the
       chain — all UPCs matched or not. Used for data recovery.
@@ -431,6 +455,7 @@ def load_data_into_distro_grid(conn, df, selected_chain, season: str):
         raise ValueError("Missing database or schema in session state (toml_info).")
 
     dg_table = f'"{db}"."{schema}".DISTRO_GRID'
+    dg_upload_table = f'"{db}"."{schema}".DISTRO_GRID_UPLOAD'                   # session temp table for the bulk load
     dg_archive_full_table = f'"{db}"."{schema}".DISTRO_GRID_ARCHIVE_FULL'       # renamed from DISTRO_GRID_ARCHIVE — full recovery backup
     dg_archive_matched_table = f'"{db}"."{schema}".DISTRO_GRID_MATCHED_ARCHIVE' # new — filtered archive for Placement Intelligence
     archive_tracking_table = f'"{db}"."{schema}".DG_ARCHIVE_TRACKING'
@@ -452,6 +477,62 @@ def load_data_into_distro_grid(conn, df, selected_chain, season: str):
     tracking_tenant_id = df["TENANT_ID"].iloc[0]
 
     try:
+        insert_columns = [
+            "CUSTOMER_ID",
+            "CHAIN_NAME",
+            "STORE_NAME",
+            "STORE_NUMBER",
+            "UPC",
+            "PRODUCT_ID",
+            "PRODUCT_NAME",
+            "YES_NO",
+            "COUNTY",
+            "TENANT_ID",
+        ]
+
+        # Pre-flight null check (before touching DB)
+        # Nullable columns are allowed to be None/empty — all others must have a value.
+        # Column-wise masks instead of materialising df.values.tolist() and looping per cell.
+        nullable = {
+            "CUSTOMER_ID",
+            "PRODUCT_ID",
+            "COUNTY",
+        }
+        required_columns = [c for c in insert_columns if c not in nullable]
+        invalid = pd.DataFrame(
+            {
+                col: df[col].isna()
+                | (df[col].astype(str).str.strip().str.upper() == "NAN")
+                for col in required_columns
+            }
+        ).to_numpy()
+        if invalid.any():
+            i = int(invalid.any(axis=1).argmax())
+            col_name = required_columns[int(invalid[i].argmax())]
+            raise ValueError(
+                f"Row {i + 1}, column '{col_name}' has an invalid null value. "
+                f"Please fix the data and re-upload."
+            )
+
+        # 📤 Stage new rows (PUT + COPY). The temp table carries only the loaded
+        # columns (LIKE would copy DISTRO_GRID's NOT NULL columns the load never
+        # fills). write_pandas creates its own temp stage — DDL, which commits
+        # implicitly — so it must finish before the transaction below opens.
+        cur.execute(
+            f"CREATE OR REPLACE TEMPORARY TABLE {dg_upload_table} AS "
+            f"SELECT {', '.join(insert_columns)} FROM {dg_table} WHERE 1 = 0"
+        )
+        write_pandas(
+            conn,
+            df[insert_columns],
+            "DISTRO_GRID_UPLOAD",
+            database=db,
+            schema=schema,
+            quote_identifiers=False,
+            chunk_size=100_000,
+            parallel=4,
+        )
+
         # Begin explicit transaction — nothing commits until we say so
         conn.autocommit(False)
 
@@ -538,51 +619,20 @@ def load_data_into_distro_grid(conn, df, selected_chain, season: str):
             (chain_upper,),
         )
 
-        # 📥 Step 4: Validate + insert new data
-        insert_columns = [
-            "CUSTOMER_ID",
-            "CHAIN_NAME",
-            "STORE_NAME",
-            "STORE_NUMBER",
-            "UPC",
-            "PRODUCT_ID",
-            "PRODUCT_NAME",
-            "YES_NO",
-            "COUNTY",
-            "TENANT_ID",
-        ]
-        insert_query = f"""
+        # 📥 Step 4: Insert new data from the staged temp table
+        cur.execute(f"""
             INSERT INTO {dg_table} (
                 {", ".join(insert_columns)},
                 CREATED_AT, UPDATED_AT, LAST_LOAD_DATE
             )
-            VALUES ({", ".join(["%s"] * len(insert_columns))},
-                    CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP(), CURRENT_DATE())
-        """
-        records = df[insert_columns].values.tolist()
-
-        # Pre-flight null check (before touching DB)
-        # Nullable columns are allowed to be None/empty — all others must have a value
-        nullable = {
-            "CUSTOMER_ID",
-            "PRODUCT_ID",
-            "COUNTY",
-        }
-        for i, row in enumerate(records):
-            for j, val in enumerate(row):
-                col_name = insert_columns[j]
-                if col_name not in nullable and (
-                    pd.isna(val) or str(val).strip().upper() == "NAN"
-                ):
-                    raise ValueError(
-                        f"Row {i + 1}, column '{col_name}' has an invalid null value. "
-                        f"Please fix the data and re-upload."
-                    )
-
-        cur.executemany(insert_query, records)
+            SELECT {", ".join(insert_columns)},
+                   CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP(), CURRENT_DATE()
+            FROM {dg_upload_table}
+        """)
 
         # ✅ All steps succeeded — commit the full transaction
         conn.commit()
+        clear_dropdown_caches()  # new chain/season values show up immediately
 
     except Exception as e:
         # ❌ Any failure rolls back archive + delete + insert atomically
@@ -5,7 +5,9 @@ Gap Report Builder (Streamlit-free)
 Page overview for future devs:
 - Runs PROCESS_GAP_REPORT() using the provided tenant connection.
 - Reads from GAP_REPORT view/table with optional filters.
-- Writes a temp Excel file and returns the filepath.
+- fetch_gap_report_df() returns the rows as a DataFrame (pipelines).
+- create_gap_report() writes a temp Excel file and returns the filepath
+  (user-facing download).
 
 Hard rules:
 - NO streamlit imports / st.session_state.
@@ -22,7 +24,7 @@ from typing import Optional
 import pandas as pd
 
 
-def create_gap_report(
+def fetch_gap_report_df(
     conn,
     salesperson: str = "All",
     chain: str = "All",
@@ -30,9 +32,9 @@ def create_gap_report(
     *,
     proc_fqn: Optional[str] = None,
     view_fqn: Optional[str] = None,
-) -> str:
+) -> pd.DataFrame:
     """
-    Build a gap report Excel file from the GAP_REPORT view.
+    Run PROCESS_GAP_REPORT() and return the filtered GAP_REPORT rows.
 
     Args:
         conn: Tenant Snowflake connection (already scoped to tenant DB/Schema context).
@@ -45,7 +47,7 @@ def create_gap_report(
                   If None, uses 'GAP_REPORT' in current context.
 
     Returns:
-        Path to generated .xlsx file.
+        DataFrame of GAP_REPORT rows.
     """
     proc_sql = f"CALL {proc_fqn}()" if proc_fqn else "CALL PROCESS_GAP_REPORT()"
     view_name = view_fqn or "GAP_REPORT"
@@ -85,7 +87,38 @@ def create_gap_report(
     finally:
         cur.close()
 
-    # 3) Write temp Excel
+    return df
+
+
+def create_gap_report(
+    conn,
+    salesperson: str = "All",
+    chain: str = "All",
+    supplier: str = "All",
+    *,
+    proc_fqn: Optional[str] = None,
+    view_fqn: Optional[str] = None,
+) -> str:
+    """
+    Build a gap report Excel file from the GAP_REPORT view.
+
+    Same arguments as fetch_gap_report_df(). Only for the user-facing
+    download — callers that just need the data should use
+    fetch_gap_report_df() and skip the Excel write/read round-trip.
+
+    Returns:
+        Path to generated .xlsx file.
+    """
+    df = fetch_gap_report_df(
+        conn,
+        salesperson,
+        chain,
+        supplier,
+        proc_fqn=proc_fqn,
+        view_fqn=view_fqn,
+    )
+
+    # Write temp Excel
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     fd, path = tempfile.mkstemp(prefix=f"gap_report_{ts}_", suffix=".xlsx")
     os.close(fd)
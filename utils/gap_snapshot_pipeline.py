@@ -7,7 +7,7 @@ Page overview for future devs:
 - Publishes tenant-wide weekly snapshots into:
     - GAP_REPORT_RUNS (header row per week)
     - GAP_REPORT_SNAPSHOT (detail rows)
-- Snapshot is built from the UNFILTERED Excel gap report (create_gap_report(..., "All","All","All")).
+- Snapshot is built from the UNFILTERED gap report rows (fetch_gap_report_df(..., "All","All","All")).
 
 Hard rules:
 - NO Streamlit imports / st.session_state.
@@ -19,13 +19,12 @@ Hard rules:
     - publish weekly snapshot (tenant-wide)
 
 Dependencies:
-- create_gap_report(conn, chain, supplier, salesperson) -> path to Excel file
+- fetch_gap_report_df(conn, salesperson, chain, supplier) -> DataFrame (no Excel round-trip)
 - snowflake.connector.pandas_tools.write_pandas for bulk insert
 """
 
 from __future__ import annotations
 
-import os
 from datetime import date
 from typing import Optional, Tuple, Union
 
@@ -33,10 +32,7 @@ import numpy as np
 import pandas as pd
 from snowflake.connector.pandas_tools import write_pandas
 
-# IMPORTANT: update this import path to wherever your create_gap_report lives
-# Example:
-# from utils.gap_report_builder import create_gap_report
-from utils.gap_report_builder import create_gap_report
+from utils.gap_report_builder import fetch_gap_report_df
 
 
 
@@ -128,11 +124,11 @@ def normalize_upc(value) -> Optional[str]:
 
 
 # -----------------------------------------------------------------------------
-# Snapshot DF builder (from Excel gap report)
+# Snapshot DF builder (from gap report rows)
 # -----------------------------------------------------------------------------
 def build_snapshot_df_from_gap_report(df_gaps: pd.DataFrame) -> pd.DataFrame:
     """
-    Convert the Excel gap report DF into the snapshot DF we persist.
+    Convert the gap report DF into the snapshot DF we persist.
 
     Important:
     - Normalizes UPC and SR_UPC through normalize_upc() to prevent '.0' artifacts.
@@ -320,13 +316,9 @@ def publish_weekly_snapshot_all(
     """
     snapshot_week_start = get_week_start(pd.Timestamp.utcnow().normalize())
 
-    temp_file_path: Optional[str] = None
     try:
-        temp_file_path = create_gap_report(conn, "All", "All", "All")
-        if not temp_file_path or not os.path.exists(temp_file_path):
-            return False, "Report generation failed (no file returned)."
-
-        df_gaps = pd.read_excel(temp_file_path, engine="openpyxl")
+        # Rows straight from GAP_REPORT — no temp .xlsx write + read_excel
+        df_gaps = fetch_gap_report_df(conn, "All", "All", "All")
         if df_gaps is None or df_gaps.empty:
             return False, "Generated report was empty; nothing to snapshot."
 
@@ -346,10 +338,3 @@ def publish_weekly_snapshot_all(
 
     except Exception as e:
         return False, f"Publish failed: {e}"
-
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except Exception:
-                pass
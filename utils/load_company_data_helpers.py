@@ -61,6 +61,7 @@ from openpyxl import Workbook
 from sf_connector.service_connector import connect_to_tenant_snowflake
 from utils.class_validation_helpers import ColumnRule, ValidationResult, validate_dataframe
 from utils.distro_grid.formatters import detect_upload_layout
+from utils.snowflake_utils import clear_dropdown_caches
 
 
 def validate_sales_upload(df: pd.DataFrame) -> ValidationResult:
@@ -511,10 +512,9 @@ def download_workbook(workbook, filename: str) -> None:
     """Stream an openpyxl workbook to user as .xlsx download."""
     stream = BytesIO()
     workbook.save(stream)
-    stream.seek(0)
     st.download_button(
         label="Download formatted file",
-        data=stream.read(),
+        data=stream.getvalue(),  # no seek + read() copy
         file_name=filename,
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
@@ -1789,6 +1789,7 @@ def write_customers_to_snowflake(df: pd.DataFrame) -> dict | None:
         n_changes = log_ownership_changes(conn, tenant_id, changes_df, batch_id)
 
         conn.commit()
+        clear_dropdown_caches()  # chain/salesperson filters pick up the new rows
         try:
             cursor.close()
         except Exception:
@@ -2035,6 +2036,7 @@ def write_supplier_by_county_to_snowflake(df: pd.DataFrame) -> None:
         )
 
         conn.commit()
+        clear_dropdown_caches()  # supplier filters pick up the new rows
         st.success(f"✅ Supplier by County uploaded successfully ({int(total_rows)} rows).")
 
     except Exception as e:
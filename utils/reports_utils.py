@@ -1,7 +1,6 @@
 ﻿# ---------------- utils/reports_utils.py ----------------
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 from sf_connector.service_connector import connect_to_tenant_snowflake
 
@@ -13,8 +12,9 @@ from utils.gap_report_builder import create_gap_report as _create_gap_report
 
 def fetch_distinct_values(conn, table_name, column_name):
     query = f"SELECT DISTINCT {column_name} FROM {table_name}"
-    df = pd.read_sql(query, conn)
-    return df[column_name].dropna().tolist()
+    with conn.cursor() as cur:
+        cur.execute(query)
+        return [row[0] for row in cur.fetchall() if row[0] is not None]
 
 
 
@@ -2,11 +2,11 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import openpyxl
 import re
 from datetime import datetime, date, time
 from openpyxl.styles import NamedStyle
+from snowflake.connector.pandas_tools import write_pandas
 from sf_connector.service_connector import connect_to_tenant_snowflake
 from openpyxl.utils import column_index_from_string, get_column_letter
 from openpyxl import Workbook
@@ -217,6 +217,7 @@ def enrich_reset_schedule_with_customer_data(
             WHERE TENANT_ID = %s
               AND CHAIN_NAME = %s
               AND ACCOUNT_STATUS = 'ACTIVE'
+              AND STORE_NUMBER IS NOT NULL
             """,
             (tenant_id, chain_upper),
         )
@@ -224,17 +225,23 @@ def enrich_reset_schedule_with_customer_data(
     finally:
         cur.close()
 
-    lookup = {
-        str(row[0]).strip(): {"ADDRESS": row[1], "CITY": row[2], "COUNTY": row[3]}
-        for row in rows
-    }
+    # Lookup frame indexed by normalized STORE_NUMBER; Series.map(Series)
+    # is an index join, so no per-row Python lambdas. Last row wins on dupes.
+    # Keys are built per row so a stray NULL can't turn the column float
+    # ('101.0') and miss every upload key.
+    rows = [r for r in rows if r[0] is not None]
+    lookup = pd.DataFrame(
+        [r[1:] for r in rows],
+        index=[str(r[0]).strip() for r in rows],
+        columns=["ADDRESS", "CITY", "COUNTY"],
+    )
+    lookup = lookup[~lookup.index.duplicated(keep="last")]
 
     df = df.copy()
     store_numbers = df["STORE_NUMBER"].astype(str).str.strip()
 
-    df["ADDRESS"] = store_numbers.map(lambda sn: lookup.get(sn, {}).get("ADDRESS"))
-    df["CITY"] = store_numbers.map(lambda sn: lookup.get(sn, {}).get("CITY"))
-    df["COUNTY"] = store_numbers.map(lambda sn: lookup.get(sn, {}).get("COUNTY"))
+    for col in ("ADDRESS", "CITY", "COUNTY"):
+        df[col] = store_numbers.map(lookup[col])
     df["STATE"] = ""
 
     return df
@@ -261,9 +268,11 @@ def upload_reset_data(df: pd.DataFrame, selected_chain: str):
         st.warning("CHAIN_NAME and STORE_NAME cannot be null. Please correct and try again.")
         return
 
-    mismatches = df.loc[df['CHAIN_NAME'].str.upper() != selected_chain]
-    if not mismatches.empty:
-        st.warning(f"CHAIN_NAME mismatch: Found {len(mismatches)} rows not matching '{selected_chain}'.")
+    # Boolean mask only; the count is computed on the (rare) failure path
+    chain_matches = df['CHAIN_NAME'].str.upper().to_numpy() == selected_chain
+    if not chain_matches.all():
+        mismatch_count = int((~chain_matches).sum())
+        st.warning(f"CHAIN_NAME mismatch: Found {mismatch_count} rows not matching '{selected_chain}'.")
         return
 
     try:
@@ -272,18 +281,16 @@ def upload_reset_data(df: pd.DataFrame, selected_chain: str):
 
         df['TENANT_ID'] = tenant_id
 
-        # Convert to Snowflake-safe ISO strings (pyformat cannot bind Python datetime objects)
-        df['CREATED_AT'] = now.strftime("%Y-%m-%d %H:%M:%S")
-        df['UPDATED_AT'] = now.strftime("%Y-%m-%d %H:%M:%S")
-        df['LAST_LOAD_DATE'] = today.strftime("%Y-%m-%d")
+        # Typed columns: write_pandas serialises datetime/date/time natively
+        # through Arrow, so no string formatting is needed.
+        df['CREATED_AT'] = now
+        df['UPDATED_AT'] = now
+        df['LAST_LOAD_DATE'] = today
 
-        # Normalize RESET_DATE → YYYY-MM-DD
-        df['RESET_DATE'] = (
-            pd.to_datetime(df['RESET_DATE'], errors='coerce')
-              .dt.strftime("%Y-%m-%d")
-        )
+        # Normalize RESET_DATE → date (unparseable → NULL)
+        df['RESET_DATE'] = pd.to_datetime(df['RESET_DATE'], errors='coerce').dt.date
 
-        # Normalize RESET_TIME → HH:MM:SS
+        # Normalize RESET_TIME → datetime.time
         # pd.to_datetime() cannot handle time objects or AM/PM strings reliably.
         # _normalize_time() handles all formats openpyxl may return:
         # time objects, datetime objects, "6:00 AM" strings, and Excel decimal fractions.
@@ -295,33 +302,29 @@ def upload_reset_data(df: pd.DataFrame, selected_chain: str):
                     return None
             except Exception:
                 pass
-            from datetime import time as time_type
-            if isinstance(val, time_type):
-                return val.strftime("%H:%M:%S")
             if isinstance(val, datetime):
-                return val.strftime("%H:%M:%S")
+                return val.time()
+            if isinstance(val, time):
+                return val
             s = str(val).strip()
             if not s or s.lower() == 'nan':
                 return None
             for fmt in ("%I:%M %p", "%I:%M%p", "%H:%M:%S", "%H:%M"):
                 try:
-                    return datetime.strptime(s, fmt).strftime("%H:%M:%S")
+                    return datetime.strptime(s, fmt).time()
                 except ValueError:
                     continue
-            # Excel decimal fraction (e.g. 0.25 = 6:00 AM)
+            # Excel decimal fraction (e.g. 0.25 = 6:00 AM); whole days are the date part
             try:
                 f = float(s)
-                total_seconds = int(f * 86400)
+                total_seconds = int(f * 86400) % 86400
                 h, rem = divmod(total_seconds, 3600)
                 m, sec = divmod(rem, 60)
-                return f"{h:02d}:{m:02d}:{sec:02d}"
+                return time(h, m, sec)
             except Exception:
                 return None
 
-        df['RESET_TIME'] = df['RESET_TIME'].apply(_normalize_time)
-
-
-        df.replace({np.nan: None, '': None}, inplace=True)
+        df['RESET_TIME'] = df['RESET_TIME'].map(_normalize_time)
 
         expected_columns = [
             'CHAIN_NAME', 'STORE_NUMBER', 'STORE_NAME', 'CITY', 'ADDRESS',
@@ -329,35 +332,45 @@ def upload_reset_data(df: pd.DataFrame, selected_chain: str):
             'TENANT_ID', 'CREATED_AT', 'UPDATED_AT', 'LAST_LOAD_DATE'
         ]
 
-        df = df[expected_columns]
-
-        placeholders = ', '.join(['%s'] * len(expected_columns))
+        # NaN/NaT already travel as NULL through Arrow; only blank strings need mapping
+        df = df[expected_columns].replace({'': None})
 
+        column_list = ', '.join(expected_columns)
         delete_query = "DELETE FROM RESET_SCHEDULE WHERE TRIM(UPPER(CHAIN_NAME)) = %s"
-        insert_query = f"INSERT INTO RESET_SCHEDULE ({', '.join(expected_columns)}) VALUES ({placeholders})"
-
-        def _safe_val(v):
-            if v is None:
-                return None
-            if isinstance(v, (np.integer,)):
-                return int(v)
-            if isinstance(v, (np.floating,)):
-                return float(v)
-            if isinstance(v, (np.bool_,)):
-                return bool(v)
-            return v
+        insert_query = (
+            f"INSERT INTO RESET_SCHEDULE ({column_list}) "
+            f"SELECT {column_list} FROM RESET_SCHEDULE_UPLOAD"
+        )
 
         with conn.cursor() as cur:
-            cur.execute("BEGIN;")
+            # Bulk-load the new rows (Parquet PUT + one COPY INTO) into a session
+            # temp table first. write_pandas issues DDL (temp stage), which would
+            # implicitly commit an open transaction, so it runs before the transaction opens.
+            # The temp table carries only the uploaded columns (LIKE would copy
+            # RESET_SCHEDULE's NOT NULL columns the load never fills).
+            st.info("Staging new records for RESET_SCHEDULE...")
+            cur.execute(
+                "CREATE OR REPLACE TEMPORARY TABLE RESET_SCHEDULE_UPLOAD AS "
+                f"SELECT {column_list} FROM RESET_SCHEDULE WHERE 1 = 0"
+            )
+            write_pandas(
+                conn,
+                df,
+                "RESET_SCHEDULE_UPLOAD",
+                quote_identifiers=False,
+                chunk_size=100_000,
+                parallel=4,
+                use_logical_type=True,
+            )
+
+            # DELETE + INSERT commit together (or not at all) — one explicit
+            # transaction on this dedicated connection, same as the Distro Grid load
+            conn.autocommit(False)
             st.info(f"Removing existing RESET_SCHEDULE records for: {selected_chain}")
             cur.execute(delete_query, (selected_chain.strip(),))
 
             st.info("Inserting new records into RESET_SCHEDULE...")
-            rows = [
-                [_safe_val(v) for v in row]
-                for row in df.values.tolist()
-            ]
-            cur.executemany(insert_query, rows)
+            cur.execute(insert_query)
             conn.commit()
 
         st.success(f"✅ Reset schedule uploaded for chain: {selected_chain}")
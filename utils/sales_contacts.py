@@ -629,20 +629,20 @@ REASSIGNMENT_TABLE_MAP: Dict[str, str] = {
 }
 
 
-def _table_has_column(conn, table_name: str, column_name: str) -> bool:
+def _table_has_column(cur, table_name: str, column_name: str) -> bool:
     """
     Return True if the table has the column (case-insensitive).
 
     Uses DESC TABLE to avoid INFORMATION_SCHEMA issues/permissions.
+    Runs on the caller's open cursor so per-table probes don't open a new one.
     """
     table_name = _qualify_ident(table_name)
     col = (column_name or "").strip().upper()
     if not col:
         return False
 
-    with conn.cursor() as cur:
-        cur.execute(f"DESC TABLE {table_name}")
-        rows = cur.fetchall()
+    cur.execute(f"DESC TABLE {table_name}")
+    rows = cur.fetchall()
 
     cols = {str(r[0]).strip().upper() for r in rows} if rows else set()
     return col in cols
@@ -670,7 +670,7 @@ def preview_salesperson_reassignment(
             table_name = _qualify_ident(table_name)
             col_name = _qualify_ident(col_name)
 
-            has_tenant = _table_has_column(conn, table_name, "TENANT_ID")
+            has_tenant = _table_has_column(cur, table_name, "TENANT_ID")
 
             if has_tenant:
                 sql = f"""
@@ -702,6 +702,7 @@ def apply_salesperson_reassignment(
     new_salesperson: str,
     table_map: Dict[str, str] = REASSIGNMENT_TABLE_MAP,
     update_sales_contacts: bool = False,  # ✅ SAFE DEFAULT
+    manage_transaction: bool = True,
 ) -> Dict[str, int]:
     """
     Update operational tables replacing old salesperson label with new label.
@@ -710,6 +711,13 @@ def apply_salesperson_reassignment(
     If update_sales_contacts=True:
       - ensures the new salesperson contact is active (does not overwrite email fields)
       - deactivates old salesperson contact
+      (both in one UPDATE; the combined row count is reported as "SALES_CONTACTS")
+
+    Transactions:
+    - manage_transaction=True (default) wraps every UPDATE in one BEGIN/COMMIT,
+      so Snowflake commits once and a failure rolls back all tables.
+    - Pass manage_transaction=False when the caller has already issued BEGIN
+      and owns the COMMIT/ROLLBACK.
     """
     tid = int(tenant_id)
     old_norm = _normalize_salesperson_label(old_salesperson)
@@ -725,58 +733,62 @@ def apply_salesperson_reassignment(
     updated_counts: Dict[str, int] = {}
 
     with conn.cursor() as cur:
-        for table_name, col_name in table_map.items():
-            table_name = _qualify_ident(table_name)
-            col_name = _qualify_ident(col_name)
-
-            has_tenant = _table_has_column(conn, table_name, "TENANT_ID")
-
-            if has_tenant:
-                sql = f"""
-                    UPDATE {table_name}
-                       SET {col_name} = %s
+        if manage_transaction:
+            cur.execute("BEGIN")
+
+        try:
+            for table_name, col_name in table_map.items():
+                table_name = _qualify_ident(table_name)
+                col_name = _qualify_ident(col_name)
+
+                has_tenant = _table_has_column(cur, table_name, "TENANT_ID")
+
+                if has_tenant:
+                    sql = f"""
+                        UPDATE {table_name}
+                           SET {col_name} = %s
+                         WHERE TENANT_ID = %s
+                           AND UPPER({col_name}) = UPPER(%s)
+                    """
+                    params = (new_norm, tid, old_norm)
+                else:
+                    sql = f"""
+                        UPDATE {table_name}
+                           SET {col_name} = %s
+                         WHERE UPPER({col_name}) = UPPER(%s)
+                    """
+                    params = (new_norm, old_norm)
+
+                cur.execute(sql, params)
+                updated_counts[table_name] = int(cur.rowcount or 0)
+
+            if update_sales_contacts:
+                # DO NOT rename the old row to the new name.
+                # Instead: deactivate old and ensure new is active — one
+                # UPDATE ... CASE WHEN round-trip; one statement, so both rows
+                # get the same CURRENT_TIMESTAMP() as every other writer here.
+                cur.execute(
+                    """
+                    UPDATE SALES_CONTACTS
+                       SET IS_ACTIVE = CASE
+                               WHEN UPPER(SALESPERSON_NAME) = UPPER(%s) THEN FALSE
+                               WHEN UPPER(SALESPERSON_NAME) = UPPER(%s) THEN TRUE
+                               ELSE IS_ACTIVE
+                           END,
+                           UPDATED_AT = CURRENT_TIMESTAMP()
                      WHERE TENANT_ID = %s
-                       AND UPPER({col_name}) = UPPER(%s)
-                """
-                params = (new_norm, tid, old_norm)
-            else:
-                sql = f"""
-                    UPDATE {table_name}
-                       SET {col_name} = %s
-                     WHERE UPPER({col_name}) = UPPER(%s)
-                """
-                params = (new_norm, old_norm)
-
-            cur.execute(sql, params)
-            updated_counts[table_name] = int(cur.rowcount or 0)
-
-        if update_sales_contacts:
-            # DO NOT rename the old row to the new name.
-            # Instead: deactivate old and ensure new is active.
-            cur.execute(
-                """
-                UPDATE SALES_CONTACTS
-                   SET IS_ACTIVE = FALSE,
-                       UPDATED_AT = CURRENT_TIMESTAMP()
-                 WHERE TENANT_ID = %s
-                   AND UPPER(SALESPERSON_NAME) = UPPER(%s)
-                """,
-                (tid, old_norm),
-            )
-            updated_counts["SALES_CONTACTS_DEACTIVATED"] = int(cur.rowcount or 0)
-
-            cur.execute(
-                """
-                UPDATE SALES_CONTACTS
-                   SET IS_ACTIVE = TRUE,
-                       UPDATED_AT = CURRENT_TIMESTAMP()
-                 WHERE TENANT_ID = %s
-                   AND UPPER(SALESPERSON_NAME) = UPPER(%s)
-                """,
-                (tid, new_norm),
-            )
-            updated_counts["SALES_CONTACTS_ACTIVATED"] = int(cur.rowcount or 0)
-
-    
+                       AND UPPER(SALESPERSON_NAME) IN (UPPER(%s), UPPER(%s))
+                    """,
+                    (old_norm, new_norm, tid, old_norm, new_norm),
+                )
+                updated_counts["SALES_CONTACTS"] = int(cur.rowcount or 0)
+
+            if manage_transaction:
+                cur.execute("COMMIT")
+
+        except Exception:
+            if manage_transaction:
+                cur.execute("ROLLBACK")
+            raise
 
     return updated_counts
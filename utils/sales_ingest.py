@@ -6,8 +6,8 @@
 Page overview:
 - Ingest daily sales from CSV/XLSX via Streamlit upload (no Snowflake stage needed).
 - Validate & normalize (e.g., UPC normalization), write to SALES_RAW_IMPORT.
-- Aggregate to SALES_WEEKLY (2-year rolling) via MERGE.
-- Log lineage in SALES_UPLOAD_LOGS.
+- Aggregate to SALES_WEEKLY (2-year rolling) via MERGE, submitted asynchronously.
+- Log lineage in SALES_UPLOAD_LOGS (MERGE_QID holds the async MERGE query id).
 
 Notes for devs:
 - Tenant-aware: uses st.session_state['tenant_config'] for DB/SCHEMA/ROLE/WH context.
@@ -25,9 +25,24 @@ from sf_connector.service_connector import connect_to_tenant_snowflake
 REQUIRED_COLUMNS = ["TX_DATE", "UPC", "PRODUCT_ID", "PRODUCT_NAME", "UNITS_SOLD", "REVENUE"]
 OPTIONAL_COLUMNS = ["STORE_NUMBER", "CHAIN_NAME", "CATEGORY", "SEGMENT", "CURRENCY", "VENDOR_DOC_ID"]
 
+# Compiled once at import; reused for every UPC normalized during ingest
+_UPC_NON_DIGIT = re.compile(r"\D")
+
+# (database, schema) pairs whose SALES_UPLOAD_LOGS already has MERGE_QID this process
+_MERGE_QID_READY = set()
+
+
+def _ensure_merge_qid_column(cur, database: str, schema: str) -> None:
+    """Add SALES_UPLOAD_LOGS.MERGE_QID if missing (idempotent; once per process per schema)."""
+    key = (database, schema)
+    if key in _MERGE_QID_READY:
+        return
+    cur.execute("ALTER TABLE SALES_UPLOAD_LOGS ADD COLUMN IF NOT EXISTS MERGE_QID VARCHAR")
+    _MERGE_QID_READY.add(key)
+
 def _normalize_upc(s: str) -> str:
     """Strip all non-digits so formats like '8-10273-03038-9' -> '810273030389'."""
-    return re.sub(r"\D", "", str(s or ""))
+    return _UPC_NON_DIGIT.sub("", str(s or ""))
 
 def _coerce_and_validate(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -53,10 +68,16 @@ def _coerce_and_validate(df: pd.DataFrame) -> pd.DataFrame:
         if col in df.columns:
             df[col] = df[col].astype(str).str.strip()
 
-    # Drop bad rows
-    df = df.dropna(subset=["TX_DATE", "UPC", "PRODUCT_ID", "UNITS_SOLD"])
-    df = df[df["UNITS_SOLD"] >= 0]
-    df = df[df["REVENUE"].fillna(0) >= 0]
+    # Drop bad rows (one combined mask -> one filtered copy)
+    mask = (
+        df["TX_DATE"].notna()
+        & df["UPC"].notna()
+        & df["PRODUCT_ID"].notna()
+        & df["UNITS_SOLD"].notna()
+        & (df["UNITS_SOLD"] >= 0)
+        & (df["REVENUE"].fillna(0) >= 0)
+    )
+    df = df.loc[mask].reset_index(drop=True)
 
     return df
 
@@ -72,6 +93,8 @@ def load_sales_file(file, *, source: str = "CSV") -> str:
     with conn.cursor() as cur:
         cur.execute(f"USE DATABASE {tenant['database']}")
         cur.execute(f"USE SCHEMA {tenant['schema']}")
+        # Before anything is loaded, so a missing column can't fail the run mid-way
+        _ensure_merge_qid_column(cur, tenant["database"], tenant["schema"])
 
     # Read file
     df = (pd.read_excel(file) if file.name.lower().endswith((".xlsx", ".xls"))
@@ -106,8 +129,10 @@ def load_sales_file(file, *, source: str = "CSV") -> str:
         # Make import_id visible in-session for MERGE
         cur.execute(f"SET import_id = '{import_id}'")
 
-        # Weekly aggregation (tenant-wide; preserves store columns if present)
-        cur.execute("""
+        # Weekly aggregation (tenant-wide; preserves store columns if present).
+        # Submitted async so the upload returns once RAW is written; callers poll
+        # get_weekly_merge_status(import_id) for completion.
+        cur.execute_async("""
             MERGE INTO SALES_WEEKLY tgt
             USING (
               SELECT
@@ -146,13 +171,64 @@ def load_sales_file(file, *, source: str = "CSV") -> str:
               s.TOTAL_UNITS, s.TOTAL_REVENUE, s.CHAIN_NAME, s.CATEGORY, s.SEGMENT, $import_id
             );
         """)
+        merge_qid = cur.sfqid
+
+        # RAW is written and the MERGE is in flight: from here on never raise,
+        # or a retry would load the file twice. If the qid can't be recorded the
+        # log row stays LOADED and the MERGE still completes server-side.
+        try:
+            cur.execute("""
+                UPDATE SALES_UPLOAD_LOGS
+                SET STATUS='AGGREGATING', NOTES='Weekly merge submitted', MERGE_QID=%s
+                WHERE UPLOAD_ID=%s
+            """, (merge_qid, import_id))
+        except Exception as e:
+            st.warning(
+                f"Sales loaded; weekly aggregation submitted (query id {merge_qid}) "
+                f"but its status could not be logged: {e}"
+            )
+
+    # Closing the connection does not abort the in-flight async MERGE
+    conn.close()
+    return import_id
 
+def get_weekly_merge_status(import_id: str, conn=None) -> str:
+    """
+    Resolve the async SALES_WEEKLY MERGE for an import.
+    Returns 'AGGREGATING', 'AGGREGATED' or 'FAILED' and records the final
+    state in SALES_UPLOAD_LOGS. Uses st.session_state['conn'] if conn is None
+    (does NOT close it).
+    """
+    conn = conn or st.session_state["conn"]
+
+    with conn.cursor() as cur:
         cur.execute("""
-            UPDATE SALES_UPLOAD_LOGS
-            SET STATUS='AGGREGATED', NOTES='Weekly merge complete'
+            SELECT STATUS, MERGE_QID
+            FROM SALES_UPLOAD_LOGS
             WHERE UPLOAD_ID=%s
         """, (import_id,))
+        row = cur.fetchone()
+        if not row:
+            raise ValueError(f"Unknown import_id: {import_id}")
 
-    conn.close()
-    return import_id
+        status, merge_qid = row
+        if status != "AGGREGATING" or not merge_qid:
+            return status
+
+        query_status = conn.get_query_status(merge_qid)
+        if conn.is_still_running(query_status):
+            return "AGGREGATING"
+
+        if conn.is_an_error(query_status):
+            status, notes = "FAILED", f"Weekly merge failed ({query_status.name})"
+        else:
+            status, notes = "AGGREGATED", "Weekly merge complete"
+
+        cur.execute("""
+            UPDATE SALES_UPLOAD_LOGS
+            SET STATUS=%s, NOTES=%s
+            WHERE UPLOAD_ID=%s
+        """, (status, notes, import_id))
+
+    return status
 
@@ -2,18 +2,20 @@
 
 
 import streamlit as st
-import snowflake.connector
 import logging
 import pandas as pd
-import os
-import jwt
-from datetime import datetime, timedelta
-from sf_connector.service_connector import get_service_account_connection
+import io
+import time
+from functools import lru_cache
+from datetime import datetime
 from utils.dashboard_data.home_dashboard import fetch_chain_schematic_data
+from utils.dashboard_data.home_dashboard import fetch_supplier_names as _cached_supplier_names
+from utils.dashboard_data.home_dashboard import clear_supplier_names_cache
 
-import numpy as np
-import getpass
-import socket
+try:
+    import pyarrow.compute as pc  # ships with snowflake-connector-python[pandas]
+except ImportError:  # pragma: no cover - fall back to row fetches
+    pc = None
 
 #--------------- Custom Import Modules ----------------------------------------------------------------------------------
 
@@ -52,8 +54,22 @@ def get_tenant_sales_report(conn=None, tenant_config=None, days: int = 90) -> pd
         st.error("❌ Tenant configuration missing database/schema.")
         return pd.DataFrame()
 
+    try:
+        # One Arrow fetch straight into a single frame (collecting
+        # iter_tenant_sales_report() batches and concatenating would hold ~2x)
+        with conn.cursor() as cur:
+            cur.execute(_sales_report_query(db, sch), (int(days),))
+            return cur.fetch_pandas_all()
+    except Exception as e:
+        st.error("❌ Failed to fetch Sales Report data")
+        st.exception(e)
+        return pd.DataFrame()
+
+
+def _sales_report_query(db: str, sch: str) -> str:
+    """SALES_REPORT rows for the last %s days (bind `days`)."""
     # NOTE: qualify db + schema; keep PURCHASED_YES_NO quoted if it’s case-sensitive
-    query = f"""
+    return f"""
         SELECT
             STORE_NUMBER,
             STORE_NAME,
@@ -62,16 +78,23 @@ def get_tenant_sales_report(conn=None, tenant_config=None, days: int = 90) -> pd
             "PURCHASED_YES_NO",
             LAST_UPLOAD_DATE
         FROM {_q(db, sch, "SALES_REPORT")}
-        WHERE LAST_UPLOAD_DATE >= DATEADD(day, -{int(days)}, CURRENT_DATE)
+        WHERE LAST_UPLOAD_DATE >= DATEADD(day, -%s, CURRENT_DATE)
         ORDER BY LAST_UPLOAD_DATE DESC
     """
 
-    try:
-        return pd.read_sql(query, conn)
-    except Exception as e:
-        st.error("❌ Failed to fetch Sales Report data")
-        st.exception(e)
-        return pd.DataFrame()
+
+def iter_tenant_sales_report(conn, db: str, sch: str, days: int = 90):
+    """
+    Yield recent SALES_REPORT rows as Arrow-backed DataFrame batches.
+
+    For callers that can fold results incrementally (counts, sums, per-store
+    rollups) — peak memory stays at one batch instead of the full result.
+    Callers that need one frame should use get_tenant_sales_report().
+    Raises on query errors; does NOT close the connection.
+    """
+    with conn.cursor() as cur:
+        cur.execute(_sales_report_query(db, sch), (int(days),))
+        yield from cur.fetch_pandas_batches()
 
 
 
@@ -90,46 +113,11 @@ def validate_toml_info(toml_info):
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
 # ===========================================================================================================================================
-# Block for Function that will connect to DB and pull data to display the the bar chart from view - Execution Summary  - Data in row 1 column 2
-# ===========================================================================================================================================
-
-def fetch_chain_schematic_data(toml_info):
-    try:
-        conn = get_service_account_connection(toml_info)
-        if not conn:
-            st.error("❌ Failed to connect using RSA authentication.")
-            return pd.DataFrame()
-
-        query = """
-            SELECT 
-                CHAIN_NAME, 
-                SUM("In_Schematic") AS TOTAL_IN_SCHEMATIC, 
-                SUM("PURCHASED_YES_NO") AS PURCHASED, 
-                SUM("PURCHASED_YES_NO") / COUNT(*) AS PURCHASED_PERCENTAGE 
-            FROM GAP_REPORT 
-            GROUP BY CHAIN_NAME
-        """
-
-        df = pd.read_sql(query, conn)
-        st.write("🔍 RAW RESULTS:", df)
-
-        if df.empty:
-            st.warning("⚠️ Query returned no data.")
-
-        df['PURCHASED_PERCENTAGE'] = (df['PURCHASED_PERCENTAGE'].astype(float) * 100).round(2).astype(str) + '%'
-        return df
-
-    except Exception as e:
-        st.error(f"⚠️ Query failed: {e}")
-        return pd.DataFrame()
-
-    finally:
-        if conn:
-            conn.close()
-
-
+# Chain schematic summary (Home dashboard bar chart) lives in
+# utils.dashboard_data.home_dashboard.fetch_chain_schematic_data (cached per
+# tenant, imported above). The old uncached copy here — which also dumped the
+# raw frame with st.write on every render — has been removed.
 # ===========================================================================================================================================
-# END Block for Function that will connect to DB and pull data to display the the bar chart from view - Execution Summary  - Data in column 3
 
 
 
@@ -144,19 +132,14 @@ def fetch_supplier_names():
         st.error("TOML information is not available. Please check the tenant ID and try again.")
         return
 
-    query = "SELECT DISTINCT supplier FROM supplier_county order by supplier"  # Adjust the query as needed
-    # Create a connection to Snowflake
-    conn_toml = get_snowflake_toml(toml_info)
-    
-    # Create a cursor object
-    cursor = conn_toml.cursor()
+    # Reuse the per-tenant session connection (do not close — shared across pages)
+    conn = st.session_state.get("conn")
+    if not conn:
+        st.error("No active Snowflake connection found. Please log in again.")
+        return
 
-    cursor.execute(query)
-    result = cursor.fetchall()
-    
-    # Safely iterate over the result
-    supplier_names = [row[0] for row in result]
-    return supplier_names
+    # Same query as the Home dashboard reader; share its per-tenant 5-minute cache
+    return _cached_supplier_names(conn, st.session_state.get("tenant_id"))
 
 #===================================================================================================
 # Function to create the gap report from data pulled from snowflake and button to download gap report
@@ -188,66 +171,40 @@ def create_gap_report_LEGACY_DO_NOT_USE(conn, salesperson, store, supplier):
         cursor.execute("CALL PROCESS_GAP_REPORT()")
         cursor.close()
 
-    # Execute SQL query and retrieve data from the Gap_Report view with filters
-    if salesperson != "All":
-        query = f"SELECT * FROM Gap_Report WHERE SALESPERSON = '{salesperson}'"
-        if store != "All":
-            query += f" AND STORE_NAME = '{store}'"
-            if supplier != "All":
-                query += f" AND SUPPLIER = '{supplier}'"
-    elif store != "All":
-        query = f"SELECT * FROM Gap_Report WHERE STORE_NAME = '{store}'"
-        if supplier != "All":
-            query += f" AND SUPPLIER = '{supplier}'"
-    else:
-        if supplier != "All":
-            query = f"SELECT * FROM Gap_Report WHERE SUPPLIER = '{supplier}'"
-        else:
-            query = "SELECT * FROM Gap_Report"
-    df = pd.read_sql(query, conn)
-
-    # Get the user's download folder
-    download_folder = os.path.expanduser(r"~\Downloads")
-
-    # Write the updated dataframe to a temporary file
-    temp_file_name = 'temp.xlsx'
-
-    # Create the full path to the temporary file
-    #temp_file_path = os.path.join(download_folder, temp_file_name)
-    temp_file_path = "temp.xlsx"
-    #df.to_excel(temp_file_path, index=False)
-    #st.write(df)
-
-    df.to_excel(temp_file_path, index=False)  # Save the DataFrame to a temporary file
-
+    # Execute SQL query and retrieve data from the Gap_Report view with filters.
+    # One bound statement for every filter combination ('All' disables a filter).
+    # Unreachable (the function raises above); kept only as legacy reference.
+    query = """
+        SELECT * FROM Gap_Report
+        WHERE (%s = 'All' OR SALESPERSON = %s)
+          AND (%s = 'All' OR STORE_NAME = %s)
+          AND (%s = 'All' OR SUPPLIER = %s)
+    """
+    params = (salesperson, salesperson, store, store, supplier, supplier)
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        df = cur.fetch_pandas_all()
 
-    # # Create the full path to the temporary file
-    # temp_file_name = 'temp.xlsx'
-    # temp_file_path = os.path.join(download_folder, temp_file_name)
+    # Stream CSV into memory for st.download_button (no temp.xlsx on disk,
+    # no openpyxl cell-by-cell write)
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    buf.seek(0)
 
-    return temp_file_path  # Return the file path
+    return buf  # Return the in-memory CSV
 
 
 
+@lru_cache(maxsize=1)
 def get_local_ip():
+    # Cached per process: the local IP doesn't change mid-session
+    import socket  # only needed here; keep it off the module import path
     try:
-        host_name = socket.gethostname()
-        ip_address = socket.gethostbyname(host_name)
-        return ip_address
-    except Exception as e:
-        st.error(f"An error occurred while getting the IP address: {e}")
-        return None
-
-
-def get_local_ip():
-    try:
-        # Get the local host name
-        host_name = socket.gethostname()
-        
-        # Get the IP address associated with the host name
-        ip_address = socket.gethostbyname(host_name)
-        
-        return ip_address
+        # UDP connect only asks the kernel for a route — no DNS lookup, no packet sent
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.1)
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
     except Exception as e:
         print(f"An error occurred while getting the IP address: {e}")
         return None
@@ -272,6 +229,21 @@ def update_spinner(message):
 # ============================================================================================================================================================
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _today_has_snapshot(_conn, tenant_id: str) -> bool:
+    """True if SALESPERSON_EXECUTION_SUMMARY_TBL has rows for today (existence probe — stops at the first row)."""
+    with _conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT 1
+            FROM SALESPERSON_EXECUTION_SUMMARY_TBL
+            WHERE LOG_DATE = CURRENT_DATE()
+            LIMIT 1
+            """
+        )
+        return cur.fetchone() is not None
+
+
 def check_and_process_data(conn=None) -> None:
     """
     Check and (optionally) refresh the salesperson gap history snapshot.
@@ -298,18 +270,11 @@ def check_and_process_data(conn=None) -> None:
         return
 
     # ---------------------------
-    # Check if today's snapshot exists
+    # Check if today's snapshot exists (cached briefly so the Yes/No button
+    # reruns don't re-query; cleared whenever we rebuild the snapshot)
     # ---------------------------
     try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT COUNT(*)
-                FROM SALESPERSON_EXECUTION_SUMMARY_TBL
-                WHERE LOG_DATE = CURRENT_DATE()
-                """
-            )
-            (count_today,) = cur.fetchone()
+        snapshot_exists = _today_has_snapshot(conn, st.session_state.get("tenant_id"))
     except Exception as e:
         st.error("Failed to check existing gap history snapshot.")
         st.exception(e)
@@ -318,7 +283,7 @@ def check_and_process_data(conn=None) -> None:
     # ---------------------------
     # If data exists for today: prompt to overwrite
     # ---------------------------
-    if count_today > 0:
+    if snapshot_exists:
         st.warning(
             "Gap history for today already exists in "
             "SALESPERSON_EXECUTION_SUMMARY_TBL.\n\n"
@@ -339,15 +304,20 @@ def check_and_process_data(conn=None) -> None:
         if overwrite:
             try:
                 with conn.cursor() as cur:
-                    # Remove today's rows
+                    # Remove today's rows and rebuild the snapshot from current
+                    # SALESPERSON_EXECUTION_SUMMARY in one round-trip and one
+                    # transaction (readers never see today's rows missing)
                     cur.execute(
                         """
+                        BEGIN;
                         DELETE FROM SALESPERSON_EXECUTION_SUMMARY_TBL
-                        WHERE LOG_DATE = CURRENT_DATE()
-                        """
+                        WHERE LOG_DATE = CURRENT_DATE();
+                        CALL BUILD_GAP_TRACKING();
+                        COMMIT;
+                        """,
+                        num_statements=4,
                     )
-                    # Rebuild snapshot from current SALESPERSON_EXECUTION_SUMMARY
-                    cur.execute("CALL BUILD_GAP_TRACKING()")
+                _today_has_snapshot.clear()
 
                 st.success(
                     "Today's gap history snapshot was overwritten via BUILD_GAP_TRACKING()."
@@ -355,6 +325,11 @@ def check_and_process_data(conn=None) -> None:
                 st.rerun()
 
             except Exception as e:
+                # Shared session connection: never leave a half-done transaction open
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
                 st.error("Failed to overwrite today's gap history snapshot.")
                 st.exception(e)
 
@@ -368,6 +343,7 @@ def check_and_process_data(conn=None) -> None:
         try:
             with conn.cursor() as cur:
                 cur.execute("CALL BUILD_GAP_TRACKING()")
+            _today_has_snapshot.clear()
 
             st.success(
                 "Gap history snapshot created for today via BUILD_GAP_TRACKING()."
@@ -395,11 +371,118 @@ def fetch_distinct_values(conn, table_name: str, column_name: str) -> list:
 
     Returns:
         List of distinct non-null values from the column.
+
+    Cached for 5 minutes per tenant (dropdown values rarely change); failures
+    are reported here and not cached.
     """
     try:
-        query = f'SELECT DISTINCT "{column_name}" FROM "{table_name}" WHERE "{column_name}" IS NOT NULL'
-        df = pd.read_sql(query, conn)
-        return sorted(df[column_name].dropna().unique().tolist())
+        return _fetch_distinct_values_cached(
+            conn, st.session_state.get("tenant_id"), table_name, column_name
+        )
     except Exception as e:
         st.error(f"❌ Error fetching distinct values from {table_name}.{column_name}: {e}")
         return []
+
+
+def _distinct_from_cursor(cur) -> list:
+    """
+    Sorted distinct values of the first column of an executed cursor.
+
+    Reads the result as one Arrow table (no per-row Python tuples) and dedups
+    with pyarrow.compute.unique; falls back to fetchall() without pyarrow.
+    """
+    if pc is None:
+        return sorted({row[0] for row in cur.fetchall() if row[0] is not None})
+    table = cur.fetch_arrow_all()
+    if table is None or table.num_rows == 0:
+        return []
+    values = pc.unique(table.column(0)).to_pylist()
+    return sorted(v for v in values if v is not None)
+
+
+# Identifiers go through IDENTIFIER() binds instead of f-string SQL: the connector
+# quotes/escapes them as literals, closing the injection hole. Binds are
+# pre-quoted to keep the case-sensitive names the old "..." SQL used.
+_DISTINCT_VALUES_SQL = (
+    "SELECT DISTINCT IDENTIFIER(%s) FROM IDENTIFIER(%s) WHERE IDENTIFIER(%s) IS NOT NULL"
+)
+
+
+def _distinct_values_params(table_name: str, column_name: str) -> tuple:
+    col = '"' + column_name.replace('"', '""') + '"'
+    return col, '"' + table_name.replace('"', '""') + '"', col
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_distinct_values_cached(_conn, tenant_id: str, table_name: str, column_name: str) -> list:
+    """Cached body of fetch_distinct_values(); tenant_id keeps tenants apart. Raises on error."""
+    with _conn.cursor() as cur:
+        cur.execute(_DISTINCT_VALUES_SQL, _distinct_values_params(table_name, column_name))
+        return _distinct_from_cursor(cur)
+
+
+def fetch_distinct_values_many(conn, pairs: list) -> dict:
+    """
+    Fetch distinct non-null values for several (table, column) pairs at once.
+
+    All queries are submitted with execute_async before any result is read,
+    so N dropdowns cost roughly one round-trip instead of N.
+
+    Args:
+        conn: Active Snowflake connection object.
+        pairs (list): (table_name, column_name) tuples.
+
+    Returns:
+        Dict mapping each (table_name, column_name) pair to its sorted list of
+        distinct values ([] if that query failed).
+
+    Cached for 5 minutes per tenant. If any query in the batch fails, falls
+    back to fetch_distinct_values() per pair so one bad pair doesn't blank
+    every dropdown.
+    """
+    try:
+        return _fetch_distinct_values_many_cached(
+            conn, st.session_state.get("tenant_id"), tuple(pairs)
+        )
+    except Exception:
+        return {
+            (table_name, column_name): fetch_distinct_values(conn, table_name, column_name)
+            for table_name, column_name in pairs
+        }
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_distinct_values_many_cached(_conn, tenant_id: str, pairs: tuple) -> dict:
+    """Cached body of fetch_distinct_values_many(); tenant_id keeps tenants apart. Raises on error."""
+    submitted = {}
+    with _conn.cursor() as cur:
+        for table_name, column_name in pairs:
+            cur.execute_async(
+                _DISTINCT_VALUES_SQL, _distinct_values_params(table_name, column_name)
+            )
+            submitted[(table_name, column_name)] = cur.sfqid
+
+    results = {}
+    for (table_name, column_name), qid in submitted.items():
+        while _conn.is_still_running(_conn.get_query_status_throw_if_error(qid)):
+            time.sleep(0.05)
+        with _conn.cursor() as cur:
+            cur.get_results_from_sfqid(qid)
+            results[(table_name, column_name)] = _distinct_from_cursor(cur)
+    return results
+
+
+def clear_dropdown_caches() -> None:
+    """
+    Drop every cached dropdown reader (distinct values, supplier names,
+    Placement Intelligence chains/seasons). Call after uploads that write
+    CUSTOMERS, SUPPLIER_COUNTY or DISTRO_GRID so filters don't show stale
+    values until the TTL expires.
+    """
+    # Local import: ai_placement_helpers pulls in the OpenAI client
+    from utils.ai_placement_helpers import clear_distinct_values_cache
+
+    _fetch_distinct_values_cached.clear()
+    _fetch_distinct_values_many_cached.clear()
+    clear_supplier_names_cache()
+    clear_distinct_values_cache()
@@ -1,6 +1,14 @@
 ﻿# utils/templates/email_templates.py
 
+from html import escape
+
+# Values are HTML-escaped before interpolation (first_name / unlocker_name are
+# user-controlled). f-strings compile with the module, so there is no
+# per-send template parsing to cache.
+
 def reset_password_template(first_name, reset_link):
+    first_name = escape(str(first_name))
+    reset_link = escape(str(reset_link))
     return f"""
     <html>
       <body>
@@ -15,6 +23,8 @@ def reset_password_template(first_name, reset_link):
     """
 
 def unlock_notification_template(first_name, unlocker_name):
+    first_name = escape(str(first_name))
+    unlocker_name = escape(str(unlocker_name))
     return f"""
     <html>
       <body>
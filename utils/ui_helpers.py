@@ -1,22 +1,40 @@
 ﻿from PIL import Image
+import logging
 import os
 import streamlit as st
 import pandas as pd
 
 from io import BytesIO
+from pathlib import Path
 from utils.dashboard_data.home_dashboard import fetch_supplier_names
 from utils.load_company_data_helpers import validate_store_numbers_for_chain
 
 FALLBACK_LOGO_PATH = "images/Default_Logo/default_logo.png"
 
-@st.cache_resource
+# App root, resolved once at import instead of os.getcwd() on every rerun
+_BASE = Path(os.getcwd()).resolve()
+
+# Cap on supplier options sent to the multiselect; narrow with the search box
+SUPPLIER_OPTION_LIMIT = 500
+
+@st.cache_data(show_spinner=False)
+def _load_logo_bytes(full_path, mtime, max_width):
+    # mtime is part of the cache key so a replaced logo file is picked up
+    img = Image.open(full_path)
+    if img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+        img = img.convert("RGBA")
+    w, h = img.size
+    aspect_ratio = h / w
+    new_height = int(max_width * aspect_ratio)
+    img = img.resize((max_width, new_height), Image.BILINEAR)
+    buf = BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
 def load_logo(full_path, max_width):
+    """Resized logo as PNG bytes (ready for st.image), or None if it can't be loaded."""
     try:
-        img = Image.open(full_path)
-        w, h = img.size
-        aspect_ratio = h / w
-        new_height = int(max_width * aspect_ratio)
-        return img.resize((max_width, new_height))
+        return _load_logo_bytes(full_path, os.path.getmtime(full_path), max_width)
     except Exception as e:
         if "logo_warned" not in st.session_state:
             print(f"[logo] Failed to load logo at {full_path}: {e}")
@@ -30,16 +48,12 @@ def add_logo(logo_path, width=240):  # Width only — height is auto-computed
     if logo_path.startswith("./"):
         logo_path = logo_path[2:]
 
-    full_path = os.path.join(os.getcwd(), logo_path)
-
-    if "logo_printed" not in st.session_state:
-        print(f"[logo] Trying to load logo at: {full_path}")
-        st.session_state["logo_printed"] = True
+    full_path = str(_BASE / logo_path)
+    logging.debug("[logo] Trying to load logo at: %s", full_path)
 
     image = load_logo(full_path, width)
     if image is None and logo_path != FALLBACK_LOGO_PATH:
-        fallback_full = os.path.join(os.getcwd(), FALLBACK_LOGO_PATH)
-        image = load_logo(fallback_full, width)
+        image = load_logo(str(_BASE / FALLBACK_LOGO_PATH), width)
 
     return image
 
@@ -54,15 +68,21 @@ def render_supplier_filter():
         return
 
     try:
-        supplier_options = fetch_supplier_names(conn)
-        supplier_options.sort()
-        supplier_options.insert(0, "All")
+        search = st.text_input("Search supplier", key="supplier_search").strip()
+        # Cached per tenant/search and already ordered by SUPPLIER in SQL
+        supplier_options = fetch_supplier_names(
+            conn, st.session_state.get("tenant_id"), search, SUPPLIER_OPTION_LIMIT
+        )
+
+        # Keep current picks selectable even when the search/limit hides them
+        current = st.session_state.get("selected_suppliers", supplier_options[:2])
+        choices = supplier_options + [s for s in current if s not in supplier_options]
 
        # st.markdown("### 📦 Filter Suppliers")
         selected = st.multiselect(
             "Choose Suppliers",
-            supplier_options[1:],  # Skip "All"
-            default=st.session_state.get("selected_suppliers", supplier_options[1:3]),
+            choices,
+            default=current,
             max_selections=5,
             key="supplier_selector"
         )
@@ -77,12 +97,11 @@ def render_supplier_filter():
 def download_workbook(workbook, filename):
     stream = BytesIO()
     workbook.save(stream)
-    stream.seek(0)
     st.download_button(
         label="Download formatted file",
-        data=stream.read(),
+        data=stream.getvalue(),  # no seek + read() copy
         file_name=filename,
-        mime='application/vnd.ms-excel'
+        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
 
 